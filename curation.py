@@ -0,0 +1,497 @@
+import pandas as pd
+from datetime import datetime
+import pytz
+import os
+import tempfile
+import re
+import openpyxl
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Alignment
+import numpy as np
+import rule_pack
+
+# Function to read the source file
+def read_source_file(source_path, nrows=None):
+    xl = pd.ExcelFile(source_path)
+    df1 = xl.parse('Sheet1', nrows=nrows)
+    df2 = xl.parse('Sheet2', nrows=nrows)
+    return df1, df2
+
+# Function to create the transaction DataFrame
+def create_transaction_df(df1, df2):
+    columns_mapping = {
+        'Transaction Upload ID': 'Realfin INFRA Transaction Upload ID',
+        'Transaction Name': 'Transaction Name',
+        'Transaction Asset Class': 'Infrastructure',  # Column C has a fixed value
+        'Transaction Status': 'Transaction Stage',
+        'Finance Type': 'Finance Type',
+        'Transaction Type': 'Transaction Type',
+        'Unknown Asset': None,  # Column G is blank
+        'Underlying Asset Configuration': None,  # Column H is blank
+        'Transaction Local Currency': 'Transaction Currency',
+        'Transaction Value (Local Currency)': 'Transaction Value (Local Currency m)',
+        'Transaction Debt (Local Currency)': 'Transaction Debt (Local Currency m)',
+        'Transaction Equity (Local Currency)': 'Transaction Equity (Local Currency m)',
+        'Debt/Equity Ratio': 'Debt/Equity Ratio',
+        'Underlying Number of Assets': None,  # Column N is blank
+        'Region - Country': 'Transaction Country/Region',
+        'Region - State': None,  # Column P is blank
+        'Region - City': None,  # Column Q is blank
+        'Any Level Sectors': ['Transaction Sector', 'Transaction Sub-sector'],
+        'PPP': 'PPP',
+        'Concession Period': 'Concession Period',
+        'Contract': 'Contract',
+        'SPV': None,  # Column V will be filled later
+        'Active': 'True',  # Column W has a fixed value 'True'
+    }
+
+    transaction_data = {}
+    for dest_col, source_col in columns_mapping.items():
+        if source_col is None:
+            transaction_data[dest_col] = [None] * len(df1)
+        elif source_col == 'Infrastructure':
+            transaction_data[dest_col] = ['Infrastructure'] * len(df1)
+        elif source_col == 'True':
+            transaction_data[dest_col] = ['True'] * len(df1)
+        elif isinstance(source_col, list):
+            transaction_data[dest_col] = df1[source_col[0]].astype(str) + ', ' + df1[source_col[1]].astype(str)
+        else:
+            transaction_data[dest_col] = df1[source_col] if source_col in df1.columns else [None] * len(df1)
+
+    transaction_df = pd.DataFrame(transaction_data)
+    
+    spv_mapping = df2.set_index('Realfin INFRA Transaction Upload ID')['SPV'].dropna().to_dict()
+    transaction_df['SPV'] = transaction_df['Transaction Upload ID'].map(spv_mapping)
+
+    return transaction_df
+
+# Function to clean up the Transaction Name column
+def clean_transaction_name(transaction_df):
+    transaction_df['Transaction Name'] = transaction_df['Transaction Name'].str.strip()  # Remove leading/trailing spaces
+    transaction_df['Transaction Name'] = transaction_df['Transaction Name'].apply(lambda x: re.sub(r'\s+', ' ', x))  # Replace multiple spaces with single space
+    return transaction_df
+
+# Function to apply compiled (old, new) substring replacements in order
+def apply_replacements(df, column, replacements):
+    def replace_value(cell_value):
+        if isinstance(cell_value, str):
+            for old, new in replacements:
+                cell_value = cell_value.replace(old, new)
+        return cell_value
+
+    df[column] = df[column].apply(replace_value)
+
+# Function to apply compiled (regex, replacement) rewrites in order
+def apply_regex_rewrites(df, column, rewrites):
+    def rewrite_value(cell_value):
+        if isinstance(cell_value, str):
+            for pattern, replacement in rewrites:
+                cell_value = pattern.sub(replacement, cell_value)
+        return cell_value
+
+    df[column] = df[column].apply(rewrite_value)
+
+# Function to apply replacements with exact match using a compiled lookup
+def apply_replacements_exact_match(df, column, replacements):
+    def replace_value(cell_value):
+        if isinstance(cell_value, str):
+            return replacements.get(cell_value, cell_value)
+        return cell_value
+
+    df[column] = df[column].apply(replace_value)
+
+# Function to set a column value wherever a compiled keyword regex matches the source column
+def apply_keyword_mapping(df, source_column, target_column, keyword_patterns):
+    for pattern, value in keyword_patterns:
+        # Cast to object so an all-blank column (read as float) still supports .str
+        df.loc[df[source_column].astype(object).str.contains(pattern, na=False), target_column] = value
+
+# Function to format date columns
+def format_date_columns(df, date_columns):
+    for col in date_columns:
+        if (col in df.columns) and (df[col].dtype == 'object'):
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+    return df
+
+# Function to autofit columns
+def autofit_columns(writer):
+    for sheetname in writer.sheets:
+        worksheet = writer.sheets[sheetname]
+        for col in worksheet.columns:
+            max_length = 0
+            column = get_column_letter(col[0].column)  # Get the column name
+            for cell in col:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except:
+                    pass
+            adjusted_width = (max_length + 2)
+            worksheet.column_dimensions[column].width = adjusted_width
+
+# Function to run the curation pipeline and return the output tabs in sheet order
+def build_curated_sheets(df1, df2):
+    # Create transaction DataFrame
+    transaction_df = create_transaction_df(df1, df2)
+    
+    # Clean up the Transaction Name column
+    transaction_df = clean_transaction_name(transaction_df)
+
+    # Apply word replacement to 'Any Level Sectors' column in the transaction_df
+    apply_regex_rewrites(transaction_df, 'Any Level Sectors', rule_pack.ANY_LEVEL_SECTOR_WORDS)
+    
+    # Apply specific replacements to 'Any Level Sectors' column in the transaction_df
+    apply_replacements(transaction_df, 'Any Level Sectors', rule_pack.ANY_LEVEL_SECTORS)
+    
+    # Format date columns in transaction_df
+    date_columns_transaction = ['Latest Transaction Event Date', 'Financial Close Date']
+    transaction_df = format_date_columns(transaction_df, date_columns_transaction)
+    
+    # Collect the output tabs in the order they are written to the destination file
+    sheets = {}
+    
+    # Add transaction data as the 'Transaction' sheet
+    sheets['Transaction'] = transaction_df
+    
+    # Create empty tabs with specified headers
+    sheets['Underlying_Asset'] = pd.DataFrame(columns=['Transaction Upload ID', 'Asset Upload ID'])
+    
+    # Populate the Events tab with data from Source file (Sheet1)
+    events_data = {
+        'Transaction Upload ID': df1['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df1['Latest Transaction Event Date'],
+        'Event Type': df1['Latest Transaction Event'],
+        'Event Title': [None] * len(df1)  # Column D remains empty
+    }
+    events_df = pd.DataFrame(events_data)
+    
+    # Append the additional rows for Financial Close Date (Sheet1)
+    additional_events_data = {
+        'Transaction Upload ID': df1['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df1['Financial Close Date'],
+        'Event Type': ['Financial Close'] * len(df1),  # Column C with 'Financial Close'
+        'Event Title': [None] * len(df1)  # Column D remains empty
+    }
+    additional_events_df = pd.DataFrame(additional_events_data)
+    
+    # Append the additional rows for Transaction Announced Date (Sheet2)
+    announced_events_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df2['Transaction Announced Date'].replace('N/A', pd.NA),
+        'Event Type': ['Announced'] * len(df2),  # Column C with 'Announced'
+        'Event Title': [None] * len(df2)  # Column D remains empty
+    }
+    announced_events_df = pd.DataFrame(announced_events_data)
+    
+    # Append the additional rows for Transaction Request for Proposals Date (Sheet2)
+    proposals_events_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df2['Transaction Request For Proposals Date'].replace('N/A', pd.NA),
+        'Event Type': ['Request for Proposals'] * len(df2),  # Column C with 'Request for Proposals'
+        'Event Title': [None] * len(df2)  # Column D remains empty
+    }
+    proposals_events_df = pd.DataFrame(proposals_events_data)
+    
+    # Append the additional rows for Transaction Tender Launch Date (Sheet2)
+    tender_events_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df2['Transaction Tender Launch Date'].replace('N/A', pd.NA),
+        'Event Type': ['Tender'] * len(df2),  # Column C with 'Tender'
+        'Event Title': [None] * len(df2)  # Column D remains empty
+    }
+    tender_events_df = pd.DataFrame(tender_events_data)
+    
+    # Append the additional rows for Transaction Preferred Bidder Date (Sheet2)
+    bidder_events_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Event Date': df2['Transaction Preferred Bidder Date'].replace('N/A', pd.NA),
+        'Event Type': ['Preferred Bidder'] * len(df2),  # Column C with 'Preferred Bidder'
+        'Event Title': [None] * len(df2)  # Column D remains empty
+    }
+    bidder_events_df = pd.DataFrame(bidder_events_data)
+    
+    # Concatenate all data
+    full_events_df = pd.concat([
+        events_df,
+        additional_events_df,
+        announced_events_df,
+        proposals_events_df,
+        tender_events_df,
+        bidder_events_df
+    ], ignore_index=True)
+    
+    # Format date columns in events_df
+    date_columns_events = ['Event Date']
+    full_events_df = format_date_columns(full_events_df, date_columns_events)
+    
+    # Remove rows where 'Event Date' is blank or 'N/A'
+    full_events_df = full_events_df.dropna(subset=['Event Date'])
+    full_events_df = full_events_df[full_events_df['Event Date'] != 'N/A']
+
+    # Apply replacements to 'Event Type'
+    apply_replacements(full_events_df, 'Event Type', rule_pack.EVENT_TYPE)
+
+    # Remove rows where 'Event Type' is blank
+    full_events_df = full_events_df[full_events_df['Event Type'] != '']
+
+    # Remove duplicate rows
+    full_events_df = full_events_df.drop_duplicates()
+
+    sheets['Events'] = full_events_df
+
+    # Populate the Bidders_Any tab
+    role_bidders_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Role Type': df2['Transaction Role'].replace('N/A', pd.NA),
+        'Role Subtype': None,  # Column C remains empty
+        'Company': df2['Company Name'].replace('N/A', pd.NA),
+        'Fund': None,  # Column E remains empty
+        'Bidder Status': 'Successful',  # Column F with 'Successful'
+        'Client Counterparty': df2['Advise To'].replace('N/A', pd.NA),
+        'Client Company Name': df2['Company Advised (Client Company)'].replace('N/A', pd.NA),
+        'Fund Name': None  # Column I remains empty
+    }
+    bidders_any_df = pd.DataFrame(role_bidders_data)
+    
+    # Apply replacements to 'Role Type'
+    apply_replacements(bidders_any_df, 'Role Type', rule_pack.ROLE_TYPE)
+
+    # Apply replacements to 'Client Counterparty'
+    apply_replacements(bidders_any_df, 'Client Counterparty', rule_pack.CLIENT_COUNTERPARTY)
+    
+    # Remove rows where 'Role Type' is blank, 'N/A', or 'Other'
+    bidders_any_df = bidders_any_df.dropna(subset=['Role Type'])
+    bidders_any_df = bidders_any_df[~bidders_any_df['Role Type'].astype(object).str.contains('N/A|^$|Other', na=False)]
+    
+    # Arrange columns to match the required output for Bidders_Any tab
+    bidders_any_columns = ['Transaction Upload ID', 'Role Type', 'Role Subtype', 'Company', 'Fund', 'Bidder Status', 'Client Counterparty', 'Client Company Name', 'Fund Name']
+    bidders_any_df = bidders_any_df.reindex(columns=bidders_any_columns)
+    
+    sheets['Bidders_Any'] = bidders_any_df
+
+    # Populate the Tranches tab
+    tranches_data = {
+        'Transaction Upload ID': df2.get('Realfin INFRA Transaction Upload ID'),
+        'Tranche Upload ID': df2.get('Realfin INFRA Tranche Upload ID'),
+        'Tranche Primary Type': df2.get('Tranche Instrument Primary Type'),
+        'Tranche Secondary Type': df2.get('Tranche Instrument Secondary Type'),
+        'Tranche Tertiary Type': df2.get('Tranche Instrument Tertiary Type'),
+        'Helper_Tranche Name': df2.get('Tranche Name'),
+        'Helper_Tranche Value $': df2.get('Tranche Value ($m)'),
+        'Helper_Transaction Value (USD m)': df2.get('Transaction Value (USD m)'),
+        'Helper_Transaction Value (LC m)': df2.get('Transaction Value (Local Currency m)'),
+        'Maturity Start Date': df2.get('Tranche Maturity Start Date'),
+        'Maturity End Date': df2.get('Tranche Maturity End Date'),
+        'Tenor': df2.get('Tranche Maturity Duration (Years)')
+    }
+    tranches_df = pd.DataFrame(tranches_data)
+    
+    # Apply replacements to 'Tranche Secondary Type'
+    apply_replacements_exact_match(tranches_df, 'Tranche Secondary Type', rule_pack.TRANCHE_SECONDARY_TYPE)
+
+    # Apply replacements to 'Tranche Tertiary Type'
+    apply_replacements_exact_match(tranches_df, 'Tranche Tertiary Type', rule_pack.TRANCHE_TERTIARY_TYPE)
+    
+    # Populate 'Tranche ESG Type' based on 'Helper_Tranche Name'
+    apply_keyword_mapping(tranches_df, 'Helper_Tranche Name', 'Tranche ESG Type', rule_pack.ESG_TRANCHE_NAME)
+    
+    # Populate 'Tranche ESG Type' based on 'Tranche Tertiary Type'
+    apply_keyword_mapping(tranches_df, 'Tranche Tertiary Type', 'Tranche ESG Type', rule_pack.ESG_TRANCHE_TERTIARY_TYPE)
+    
+    # Format date columns in tranches_df
+    date_columns_tranches = ['Maturity Start Date', 'Maturity End Date']
+    tranches_df = format_date_columns(tranches_df, date_columns_tranches)
+    
+    # Calculate 'Helper_Tranche Value $ as % of Transaction Value USD m'
+    tranches_df['Helper_Tranche Value $ as % of Transaction Value USD m'] = np.where(
+        tranches_df['Helper_Transaction Value (USD m)'].isna() | (tranches_df['Helper_Transaction Value (USD m)'] == 0),
+        np.nan,
+        tranches_df['Helper_Tranche Value $'] / tranches_df['Helper_Transaction Value (USD m)']
+    )
+
+
+    # Populate 'Value' column based on calculated percentage
+    tranches_df['Value'] = tranches_df['Helper_Tranche Value $ as % of Transaction Value USD m'] * tranches_df['Helper_Transaction Value (LC m)']
+
+    # Arrange columns to match the required output for Tranches tab
+    tranches_columns = [
+        'Transaction Upload ID', 'Tranche Upload ID', 'Tranche Primary Type', 'Tranche Secondary Type', 'Tranche Tertiary Type', 
+        'Value', 'Maturity Start Date', 'Maturity End Date', 'Tenor', 'Tranche ESG Type', 
+        'Helper_Tranche Name', 'Helper_Tranche Value $', 'Helper_Transaction Value (USD m)', 
+        'Helper_Transaction Value (LC m)', 'Helper_Tranche Value $ as % of Transaction Value USD m'
+    ]
+    tranches_df = tranches_df.reindex(columns=tranches_columns)
+    
+    sheets['Tranches'] = tranches_df
+
+    # Populate the Tranche_Pricings tab
+    tranche_pricings_data = {
+        'Tranche Upload ID': df2.get('Realfin INFRA Tranche Upload ID'),
+        'Tranche Benchmark': df2.get('Tranche Loan Reference Rate'),
+        'Basis Point From': df2.get('Range From'),
+        'Basis Point To': df2.get('Range To'),
+        'Period From': None,  # Column E remains empty
+        'Period To': None,  # Column F remains empty
+        'Period Duration': None,  # Column G remains empty
+        'Comment': None  # Column H remains empty
+    }
+    tranche_pricings_df = pd.DataFrame(tranche_pricings_data)
+    
+    # Remove rows where all cells are blank
+    tranche_pricings_df = tranche_pricings_df.dropna(how='all')
+
+    # Arrange columns to match the required output for Tranche_Pricings tab
+    tranche_pricings_columns = ['Tranche Upload ID', 'Tranche Benchmark', 'Basis Point From', 'Basis Point To', 'Period From', 'Period To', 'Period Duration', 'Comment']
+    tranche_pricings_df = tranche_pricings_df.reindex(columns=tranche_pricings_columns)
+    
+    sheets['Tranche_Pricings'] = tranche_pricings_df
+
+    # Populate the Tranche_Roles_Any tab
+    tranche_roles_any_data = {
+        'Transaction Upload ID': df2['Realfin INFRA Transaction Upload ID'],
+        'Tranche Upload ID': df2['Realfin INFRA Tranche Upload ID'],
+        'Tranche Role Type': df2['Tranche Role'],
+        'Company': df2['Company Name'],
+        'Fund': None,  # Column E remains empty
+        'Value': None,  # Column F remains empty
+        'Percentage': None,  # Column G remains empty
+        'Comment': None,  # Column H remains empty,
+        'Helper_Tranche Primary Type': df2['Tranche Instrument Primary Type'],
+        'Helper_Tranche Value $': df2['Tranche Value ($m)'],
+        'Helper_Transaction Value (USD m)': df2['Transaction Value (USD m)'],
+        'Helper_LT Accredited Value ($m)': df2['LT Accredited Value ($m)'],
+        'Helper_Sponsor Equity USD m': df2['Sponsor Equity (USDm)'],
+        'Helper_Tranche_Value_LC': None,
+        'Helper_Sponsor Equity $ as % of Helper_Tranche Value $': None,
+        'Helper_Sponsor Equity LC': None,
+        'Helper_LT Accredited Value ($m) as % of Helper_Tranche Value $': None,
+        'Helper_Debt Provider Underwriting Value LC': None
+    }
+    
+    tranche_roles_any_df = pd.DataFrame(tranche_roles_any_data)
+    
+    # Apply replacements and updates to 'Tranche Role Type' based on 'Helper_Tranche Primary Type'
+    tranche_roles_any_df['Tranche Role Type'] = tranche_roles_any_df.apply(
+        lambda row: 'Sponsor' if row['Helper_Tranche Primary Type'] == 'Equity' and row['Tranche Role Type'] in rule_pack.SPONSOR_EQUITY_ROLES else 
+                    'Debt Provider' if row['Helper_Tranche Primary Type'] == 'Debt' and row['Tranche Role Type'] in rule_pack.DEBT_PROVIDER_ROLES else 
+                    row['Tranche Role Type'], axis=1
+    )
+
+    apply_replacements(tranche_roles_any_df, 'Tranche Role Type', rule_pack.TRANCHE_ROLE_TYPE)
+    
+    # Copy 'Value' from 'Tranches' tab to 'Helper_Tranche Value LC' in 'Tranche_Roles_Any' tab
+    tranches_df = tranches_df.set_index('Tranche Upload ID')
+    tranche_roles_any_df = tranche_roles_any_df.set_index('Tranche Upload ID')
+    tranche_roles_any_df['Helper_Tranche Value LC'] = tranches_df['Value']
+    tranche_roles_any_df = tranche_roles_any_df.reset_index()
+
+    # Create column O + P in 'Tranche_Roles_Any' tab and populate with calculated values
+    tranche_roles_any_df['Helper_Sponsor Equity $ as % of Helper_Tranche Value $'] = np.where(
+        tranche_roles_any_df['Helper_Tranche Value $'].isna() | (tranche_roles_any_df['Helper_Tranche Value $'] == 0),
+        np.nan,
+        tranche_roles_any_df['Helper_Sponsor Equity USD m'] / tranche_roles_any_df['Helper_Tranche Value $']
+    )
+
+    tranche_roles_any_df['Helper_Sponsor Equity LC'] = tranche_roles_any_df['Helper_Sponsor Equity $ as % of Helper_Tranche Value $'] * tranche_roles_any_df['Helper_Tranche Value LC']
+
+    # Ensure 'Helper_LT Accredited Value ($m)' column exists and is properly referenced
+    # Create column Q + R in 'Tranche_Roles_Any' tab and populate with calculated values
+    if 'Helper_LT Accredited Value ($m)' in tranche_roles_any_df.columns:
+        tranche_roles_any_df['Helper_LT Accredited Value ($m) as % of Helper_Tranche Value $'] = np.where(
+            tranche_roles_any_df['Helper_Tranche Value $'].isna() | (tranche_roles_any_df['Helper_Tranche Value $'] == 0),
+            np.nan,
+            tranche_roles_any_df['Helper_LT Accredited Value ($m)'] / tranche_roles_any_df['Helper_Tranche Value $']
+        )
+        tranche_roles_any_df['Helper_Debt Provider Underwriting Value LC'] = tranche_roles_any_df['Helper_LT Accredited Value ($m) as % of Helper_Tranche Value $'] * tranche_roles_any_df['Helper_Tranche Value LC']
+    
+
+    # Populate the 'Value' column based on conditions
+    tranche_roles_any_df['Value'] = tranche_roles_any_df.apply(
+        lambda row: row['Helper_Sponsor Equity LC'] if row['Helper_Tranche Primary Type'] == 'Equity' else
+                    (row['Helper_Debt Provider Underwriting Value LC'] if row['Helper_Tranche Primary Type'] == 'Debt' else None),
+        axis=1
+    )
+    
+    # Arrange columns to match the required output for Tranche_Roles_Any tab
+    tranche_roles_any_columns = [
+        'Transaction Upload ID', 
+        'Tranche Upload ID', 
+        'Tranche Role Type', 
+        'Company', 
+        'Fund', 
+        'Value', 
+        'Percentage', 
+        'Comment',
+        'Helper_Tranche Primary Type', 
+        'Helper_Tranche Value $', 
+        'Helper_Transaction Value (USD m)', 
+        'Helper_LT Accredited Value ($m)', 
+        'Helper_Sponsor Equity USD m',
+        'Helper_Tranche Value LC', 
+        'Helper_Sponsor Equity $ as % of Helper_Tranche Value $', 
+        'Helper_Debt Provider Underwriting Value LC',
+        'Helper_LT Accredited Value ($m) as % of Helper_Tranche Value $',            
+        'Helper_Sponsor Equity LC'
+    ]
+    tranche_roles_any_df = tranche_roles_any_df.reindex(columns=tranche_roles_any_columns)
+    
+    sheets['Tranche_Roles_Any'] = tranche_roles_any_df
+
+    # Apply word replacements to specified columns in the 'Transaction' tab
+    apply_replacements(transaction_df, 'Transaction Name', rule_pack.TRANSACTION_NAME)
+    
+    apply_replacements(transaction_df, 'Transaction Status', rule_pack.TRANSACTION_STATUS)
+    
+    apply_replacements(transaction_df, 'Finance Type', rule_pack.FINANCE_TYPE)
+    
+    apply_replacements(transaction_df, 'Transaction Type', rule_pack.TRANSACTION_TYPE)
+  
+    apply_replacements(transaction_df, 'Region - Country', rule_pack.REGION_COUNTRY)
+    
+    apply_replacements(transaction_df, 'Contract', rule_pack.CONTRACT)
+    
+    # Store the updated transaction_df again to reflect changes in specified columns
+    sheets['Transaction'] = transaction_df
+
+    return sheets
+
+# Function to create the destination file in output_dir (one directory per run, so concurrent sessions never share a path)
+def create_destination_file(source_path, output_dir):
+    df1, df2 = read_source_file(source_path)
+    sheets = build_curated_sheets(df1, df2)
+    
+    # Generate the destination filename with a timestamp
+    base, ext = os.path.splitext(source_path)
+    # Set timezone to London, UK
+    london_tz = pytz.timezone('Europe/London')
+    timestamp = datetime.now(london_tz).strftime("%Y%m%d_%H%M")
+    destination_filename = os.path.join(output_dir, f"curated_INFRA2_{timestamp}.xlsx")
+    
+    with pd.ExcelWriter(destination_filename, engine='openpyxl') as writer:
+        for sheet_name, sheet_df in sheets.items():
+            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        
+        # Autofit columns for all sheets
+        autofit_columns(writer)
+        
+        # Record the rule pack version in the workbook properties (File > Info > Tags in Excel)
+        writer.book.properties.keywords = f"rule_pack:{rule_pack.RULE_PACK_VERSION}"
+    
+    return destination_filename
+
+# Function to run the pipeline on the first rows of the source file for a quick preview
+def create_preview_sheets(source_path, nrows):
+    df1, df2 = read_source_file(source_path, nrows=nrows)
+    return build_curated_sheets(df1, df2)
+
+# Function to save the uploaded file to a temporary directory
+def save_uploaded_file(file_buffer):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
+        temp_file.write(file_buffer)
+        return temp_file.name
+
+# Function to clean up temporary files
+def remove_temporary_files(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,270 @@
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+# Local load-test harness for the upload/download path of the Streamlit app.
+# Each simulated session drives main.py headlessly with Streamlit's AppTest:
+# upload the workbook (which builds the cached preview), optionally click
+# "Run full curation" (--full-run-ratio), rerun as the download click does,
+# and check that session_state holds this session's curated file. Streamlit
+# serves every session from one process with a thread per session and a
+# shared st.cache_data, so sessions run in a thread pool in one process.
+#
+# Sessions stay open until their level finishes, so per-session state (the
+# upload, the curated bytes in session_state) counts towards peak memory.
+# Peak memory is reported as the tracemalloc high-water mark of Python and
+# NumPy allocations and, on Linux, the sampled peak RSS of the process. Pass
+# --no-trace-memory for undisturbed latencies.
+#
+# Usage: python load_test.py --rows 2000 --levels 1 2 4 8 --sessions-per-level 2
+
+# Streamlit script under test
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Function to build a synthetic source workbook with the Sheet1/Sheet2 columns read by the pipeline
+def build_synthetic_workbook(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    transaction_ids = [f'T{i:06d}' for i in range(rows)]
+    dates = pd.Series(pd.date_range('2015-01-01', periods=rows, freq='D').strftime('%Y-%m-%d'))
+
+    sheet1 = pd.DataFrame({
+        'Realfin INFRA Transaction Upload ID': transaction_ids,
+        'Transaction Name': [f'Acquisition of  Project {i} and Partners ' for i in range(rows)],
+        'Transaction Stage': rng.choice(['Financial close', 'Pre-financing', 'Announced'], rows),
+        'Finance Type': rng.choice(['Project Finance', 'Corporate Finance', 'Public Sector Finance'], rows),
+        'Transaction Type': rng.choice(['Asset acquisition', 'Company acquisition', 'Additional Facility'], rows),
+        'Transaction Currency': rng.choice(['USD', 'EUR', 'GBP'], rows),
+        'Transaction Value (Local Currency m)': rng.uniform(10, 5000, rows).round(2),
+        'Transaction Debt (Local Currency m)': rng.uniform(5, 4000, rows).round(2),
+        'Transaction Equity (Local Currency m)': rng.uniform(1, 1000, rows).round(2),
+        'Debt/Equity Ratio': rng.choice(['70:30', '80:20', 'N/A'], rows),
+        'Transaction Country/Region': rng.choice(['China - Mainland', 'Myanmar (Burma)', 'United Kingdom', 'North Macedonia'], rows),
+        'Transaction Sector': rng.choice(['Power', 'Renewables', 'Transport', 'Beyond Infra'], rows),
+        'Transaction Sub-sector': rng.choice(['Coal-fired', 'Onshore Wind', 'Roads', 'Other Beyond Infrastructure', 'Biomass'], rows),
+        'PPP': rng.choice(['Yes', 'No'], rows),
+        'Concession Period': rng.choice(['25', '30', 'N/A'], rows),
+        'Contract': rng.choice(['DBFO', 'Unknown'], rows),
+        'Latest Transaction Event Date': dates,
+        'Latest Transaction Event': rng.choice(['Tender Launch', 'Transaction Announced', 'Risk Alert', 'Bank Mandate Won'], rows),
+        'Financial Close Date': dates.where(rng.random(rows) > 0.3, 'N/A'),
+    })
+
+    # One tranche per row keeps 'Realfin INFRA Tranche Upload ID' unique, as in real exports
+    primary_types = rng.choice(['Debt', 'Equity'], rows)
+    sheet2 = pd.DataFrame({
+        'Realfin INFRA Transaction Upload ID': transaction_ids,
+        'SPV': [f'SPV {i}' for i in range(rows)],
+        'Transaction Announced Date': dates,
+        'Transaction Request For Proposals Date': dates.where(rng.random(rows) > 0.5, 'N/A'),
+        'Transaction Tender Launch Date': dates.where(rng.random(rows) > 0.5, 'N/A'),
+        'Transaction Preferred Bidder Date': dates.where(rng.random(rows) > 0.5, 'N/A'),
+        'Transaction Role': rng.choice(['O&M', 'Legal Adviser', 'Other', 'N/A'], rows),
+        'Company Name': [f'Company {i % 97}' for i in range(rows)],
+        'Advise To': rng.choice(['AwardingAuthority', 'Sponsor', 'N/A'], rows),
+        'Company Advised (Client Company)': [f'Client {i % 53}' for i in range(rows)],
+        'Realfin INFRA Tranche Upload ID': [f'TR{i:06d}' for i in range(rows)],
+        'Tranche Instrument Primary Type': primary_types,
+        'Tranche Instrument Secondary Type': rng.choice(['Loans', 'Bonds', 'IFI Government Support'], rows),
+        'Tranche Instrument Tertiary Type': rng.choice(['Green Loan', 'Revolver', 'Cash Equity', 'Islamic Bond'], rows),
+        'Tranche Name': rng.choice(['Green Term Loan', 'Sukuk Tranche', 'Senior Debt', 'Sustainability Bond'], rows),
+        'Tranche Value ($m)': rng.uniform(1, 2000, rows).round(2),
+        'Transaction Value (USD m)': rng.uniform(10, 5000, rows).round(2),
+        'Transaction Value (Local Currency m)': rng.uniform(10, 5000, rows).round(2),
+        'Tranche Maturity Start Date': dates,
+        'Tranche Maturity End Date': dates,
+        'Tranche Maturity Duration (Years)': rng.integers(1, 30, rows),
+        'Tranche Loan Reference Rate': rng.choice(['SOFR', 'EURIBOR', None], rows),
+        'Range From': rng.integers(50, 300, rows),
+        'Range To': rng.integers(300, 600, rows),
+        'Tranche Role': rng.choice(['MLA', 'Participant', 'Fund', 'Multilateral'], rows),
+        'LT Accredited Value ($m)': rng.uniform(1, 500, rows).round(2),
+        'Sponsor Equity (USDm)': rng.uniform(1, 500, rows).round(2),
+    })
+
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        sheet1.to_excel(writer, sheet_name='Sheet1', index=False)
+        sheet2.to_excel(writer, sheet_name='Sheet2', index=False)
+    return buffer.getvalue()
+
+# Output tabs every curated workbook must contain, in order
+EXPECTED_SHEETS = ['Transaction', 'Underlying_Asset', 'Events', 'Bidders_Any', 'Tranches', 'Tranche_Pricings', 'Tranche_Roles_Any']
+
+# Function to check that downloaded bytes are a curated workbook for a source with expected_rows rows
+def verify_curated_file(file_bytes, expected_rows):
+    workbook = openpyxl.load_workbook(BytesIO(file_bytes), read_only=True)
+    try:
+        if workbook.sheetnames != EXPECTED_SHEETS:
+            raise ValueError(f"unexpected sheets {workbook.sheetnames}")
+        transaction_rows = sum(1 for _ in workbook['Transaction'].iter_rows(min_row=2, values_only=True))
+    finally:
+        workbook.close()
+    if transaction_rows != expected_rows:
+        raise ValueError(f"Transaction tab has {transaction_rows} rows, expected {expected_rows}")
+
+# Function to raise if a rerun of the app ended in an exception, error or warning
+def check_app_run(app, step):
+    problems = [element.value for element in list(app.exception) + list(app.error) + list(app.warning)]
+    if problems:
+        raise RuntimeError(f"{step}: {problems[0]}")
+
+# Function to run one simulated session against main.py: upload, preview and optionally the full curation and download
+def run_session(index, file_buffer, expected_rows, preview_rows, full_run, timeout):
+    started = time.perf_counter()
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    app.file_uploader[0].set_value((f"source_{index}.xlsx", file_buffer, XLSX_MIME)).run()
+    check_app_run(app, "upload")
+    if app.number_input[0].value != preview_rows:
+        app.number_input[0].set_value(preview_rows).run()
+        check_app_run(app, "preview")
+
+    if full_run:
+        app.button[0].click().run()
+        check_app_run(app, "full run")
+        # Clicking Download reruns the script; the curated file must survive it
+        app.run()
+        check_app_run(app, "download rerun")
+        _, _, curated_bytes = app.session_state['curated_file']
+    latency = time.perf_counter() - started
+
+    if full_run:
+        verify_curated_file(curated_bytes, expected_rows)
+    return latency, app
+
+# Class to sample the process RSS in the background and keep the peak (Linux only, NaN elsewhere)
+class PeakRssSampler:
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_bytes = np.nan
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        while True:
+            try:
+                with open('/proc/self/statm') as statm:
+                    rss_bytes = int(statm.read().split()[1]) * page_size
+            except OSError:
+                return
+            self.peak_bytes = np.nanmax([self.peak_bytes, rss_bytes])
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+# Function to run one concurrency level and collect latency, throughput and memory figures
+def run_level(workbooks, concurrency, sessions, preview_rows, full_run_ratio, timeout):
+    latencies = []
+    errors = []
+    open_apps = []
+    lock = threading.Lock()
+
+    def session(index):
+        # Sessions cycle through workbooks of different sizes, so reading another session's output fails verification
+        expected_rows, file_buffer = workbooks[index % len(workbooks)]
+        # Spread the full runs evenly over the sessions
+        full_run = int((index + 1) * full_run_ratio) > int(index * full_run_ratio)
+        try:
+            latency, app = run_session(index, file_buffer, expected_rows, preview_rows, full_run, timeout)
+            with lock:
+                latencies.append(latency)
+                open_apps.append(app)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    # Start every level with an empty preview cache and its own scratch directory for temporary files
+    st.cache_data.clear()
+    default_tempdir = tempfile.tempdir
+    level_dir = tempfile.mkdtemp(prefix=f'load_test_{concurrency}_')
+    tempfile.tempdir = level_dir
+    try:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        with PeakRssSampler() as rss:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                for index in range(sessions):
+                    pool.submit(session, index)
+            elapsed = time.perf_counter() - started
+        peak_memory = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else np.nan
+        leftover_files = len(os.listdir(level_dir))
+    finally:
+        tempfile.tempdir = default_tempdir
+        shutil.rmtree(level_dir, ignore_errors=True)
+    # Close the level's sessions
+    open_apps.clear()
+
+    # Percentiles over the surviving sessions only would hide the failures, so omit them
+    report_latency = bool(latencies) and not errors
+    return {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'failed': len(errors),
+        'p50_s': np.percentile(latencies, 50) if report_latency else np.nan,
+        'p90_s': np.percentile(latencies, 90) if report_latency else np.nan,
+        'p99_s': np.percentile(latencies, 99) if report_latency else np.nan,
+        'throughput_per_s': len(latencies) / elapsed if elapsed else np.nan,
+        'peak_traced_mb': peak_memory / (1024 * 1024),
+        'peak_rss_mb': rss.peak_bytes / (1024 * 1024),
+        'leftover_files': leftover_files,
+        'first_error': errors[0] if errors else '',
+    }
+
+# Function to run every concurrency level and print the report
+def main_cli():
+    parser = argparse.ArgumentParser(description="Simulate concurrent uploads against the curation app.")
+    parser.add_argument('--rows', type=int, default=1000, help="Rows in Sheet1 and Sheet2 of the synthetic workbook")
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8], help="Concurrency levels to test")
+    parser.add_argument('--sessions-per-level', type=int, default=2, help="Sessions per concurrent slot at each level")
+    parser.add_argument('--preview-rows', type=int, default=50, help="Rows read by the preview step")
+    parser.add_argument('--full-run-ratio', type=float, default=1.0, help="Share of sessions that also run the full curation (0 to 1)")
+    parser.add_argument('--timeout', type=float, default=300, help="Seconds allowed for each script run of a session")
+    parser.add_argument('--no-trace-memory', action='store_true', help="Skip tracemalloc, which slows the sessions down, and report latency only")
+    args = parser.parse_args()
+    if not 0 <= args.full_run_ratio <= 1:
+        parser.error("--full-run-ratio must be between 0 and 1")
+
+    # One workbook size per concurrent slot, so sessions running together expect different outputs
+    workbooks = [(args.rows + i, build_synthetic_workbook(args.rows + i, seed=i)) for i in range(max(args.levels))]
+    print(f"Synthetic workbooks: {args.rows}-{args.rows + len(workbooks) - 1} rows, "
+          f"{len(workbooks[0][1]) / 1024:.0f} KiB each")
+
+    results = []
+    if not args.no_trace_memory:
+        tracemalloc.start()
+    for concurrency in args.levels:
+        results.append(run_level(workbooks, concurrency, concurrency * args.sessions_per_level,
+                                 args.preview_rows, args.full_run_ratio, args.timeout))
+    tracemalloc.stop()
+
+    report = pd.DataFrame(results)
+    with pd.option_context('display.max_colwidth', 80, 'display.width', 200, 'display.float_format', '{:.2f}'.format):
+        print(report.to_string(index=False))
+    if report['failed'].any():
+        print("Sessions failed: latency percentiles are omitted for those levels.")
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main_cli()
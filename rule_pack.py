@@ -0,0 +1,268 @@
+import hashlib
+import json
+import re
+from types import MappingProxyType
+
+# Rule pack for all mapping tables used by the curation pipeline.
+# The rules are compiled once when this module is first imported; Streamlit
+# keeps imported modules loaded across reruns, so every run reuses the same
+# compiled, read-only lookups. Dictionary order is significant: substring
+# replacements are applied in the order they are listed.
+_RULES = {
+    # Regex rewrites applied to 'Any Level Sectors' before the specific replacements, in order
+    'any_level_sector_words': [
+        # Step 1: Replace 'Coal-fired' with 'Xoal-Fired'
+        [r'Coal-fired', 'Xoal-Fired'],
+        # Step 2: Replace 'Coal' with 'Mineral'
+        [r'Coal', 'Mineral'],
+        # Step 3: Replace 'Other Power' with 'OtherConventionalEnergy' as a temporary placeholder
+        [r'Other Power', 'OtherConventionalEnergy'],
+        # Step 4: Replace 'Power' with 'Conventional Energy' only if it's not part of 'Coal-Fired Power'
+        [r'\bPower\b', 'Conventional Energy'],
+        # Step 5: Replace the temporary placeholder 'OtherConventionalEnergy' back to 'Conventional Energy'
+        [r'OtherConventionalEnergy', 'Conventional Energy'],
+        # Step 6: Replace 'Xoal-Fired' with 'Coal-Fired Power'
+        [r'Xoal-Fired', 'Coal-Fired Power'],
+        # Step 7: Replace 'Biofuels' with 'Biofuels/Biomass'
+        [r'Biofuels', 'Biofuels/Biomass'],
+        # Step 8: Replace 'Biomass' with 'Biofuels/Biomass' only if 'Biofuels/' doesn't precede it
+        [r'(?<!Biofuels/)Biomass', 'Biofuels/Biomass'],
+    ],
+    # Specific replacements in 'Any Level Sectors'
+    'any_level_sectors': {
+        'Renewables': 'Renewable Energy',
+        'Social & Defence': 'Social Infrastructure',
+        'Telecoms': 'Digital Infrastructure',
+        'Airports': 'Airport',
+        'Base Metals': 'Metal',
+        'Bridges': 'Bridge',
+        'Car Parks': 'Car Park',
+        'Co Generation': 'Cogeneration Power',
+        'Data Centres': 'Data Centre',
+        'Transmission & Distribution': 'Transmission',
+        'Distribution': 'Water Distribution',
+        'District Heating': 'Heat Network',
+        'Gas-Fired': 'Gas-Fired Power',
+        'Manufacturing': 'Processing',
+        'Maritime Transport': 'Waterway',
+        'Minerals': 'Mineral',
+        'Mobile': 'Tower',
+        'Municipal': 'Municipal Building',
+        'Nuclear': 'Nuclear Power',
+        'Offshore Wind - Fixed': 'Wind (Offshore)',
+        'Offshore Wind - Floating': 'Wind (Offshore)',
+        'Onshore Wind': 'Wind (Onshore)',
+        'Other Renewables': 'Renewable Energy',
+        'Other Telecoms': 'Digital Infrastructure',
+        'Other Transport': 'Transport',
+        'Ports': 'Port',
+        'Precious Metals': 'Metal',
+        'Roads': 'Road',
+        'Small Hydro': 'Hydro',
+        'Smart Meters': '',
+        'Solar PV - Floating': 'Solar (Floating PV)',
+        'Solar - Floating': 'Solar (Floating PV)',
+        'Solar PV': 'Solar (Land-Based PV)',
+        'Solar Thermal': 'Solar (Thermal)',
+        'Terrestrial': 'Digital Infrastructure',
+        'Transit': 'Light Transport',
+        'Treatment': 'Water Treatment',
+        'Tunnels': 'Tunnel',
+        'Waste-to-Energy': 'Waste to Energy',
+        'Other Oil & Gas': 'Oil & Gas',
+        'IWPP': '',
+        'Other Water': 'Water',
+        'Other Mining': 'Mining',
+        'Other Social & Defence': 'Social Infrastructure',
+        'Oil-fired': 'Oil-Fired Power',
+        'Fire & Rescue': 'Social Infrastructure',
+        'Street Lighting': 'Social Infrastructure',
+        'Other Digital Infrastructure': 'Digital Infrastructure',
+        'Agriculture': '',
+        'Software': '',
+        'Technology Processing': '',
+        'Other Beyond Infrastructure': '',
+        'Beyond Infra': '',
+        'Other Social Infrastructure': 'Social Infrastructure',
+        'Other Renewable Energy': 'Renewable Energy',
+    },
+    # Replacements in 'Event Type' (Events tab)
+    'event_type': {
+        'Best And Final Offer': 'Best and Final Offer',
+        'Next Milestone': '',
+        'Undisclosed Financial Close': '',
+        'Financial Close Transaction': 'Financial Close',
+        'General Announcement': '',
+        'Risk Alert': '',
+        'Adviser Mandate Won': 'Adviser Appointed',
+        'Tender Launch': 'Tender',
+        'Request for Qualification': 'Request for Qualifications',
+        'Bank Market Approach': 'Financing Sought',
+        'Transaction Announced': 'Announced',
+        'Bank Mandate Won': 'Lenders Appointed',
+        'EoI (Expression of Interest)': 'Expression of Interest',
+        'Offtake Agreement Signed': 'Offtake Agreement',
+        'Concession Signed': 'Concession Agreement',
+        'Financing Signed': 'Financing Agreement',
+        'RoI (Request for Information)': 'Request for Information',
+        'Sponsor withdrawal': '',
+    },
+    # Replacements in 'Role Type' (Bidders_Any tab)
+    'role_type': {
+        'O&M': 'Operations & Maintenance',
+    },
+    # Replacements in 'Client Counterparty' (Bidders_Any tab)
+    'client_counterparty': {
+        'AwardingAuthority': 'Awarding Authority',
+    },
+    # Exact-match replacements in 'Tranche Secondary Type' (Tranches tab)
+    'tranche_secondary_type': {
+        'Loans': 'Loan',
+        'IFI Government Support': 'Non-Commercial Instrument',
+        'Bonds': 'Bond',
+    },
+    # Exact-match replacements in 'Tranche Tertiary Type' (Tranches tab)
+    'tranche_tertiary_type': {
+        'Cash Equity': 'Equity',
+        'Revolver': 'Revolving Credit Facility',
+        'Credit Facility': '',
+        'Bridge Facility': 'Bridge',
+        'Green Bond': '',
+        'Green Loan': '',
+        'Sustainability-linked Loan': '',
+        'Working Capital': 'Working Capital Facility',
+        'Government Loan': 'State Loan',
+        'Sustainability-linked Bond': '',
+        'Mezzanine Debt': 'Mezzanine',
+        'Islamic Loan': '',
+        'Islamic Bond': '',
+    },
+    # 'Tranche ESG Type' keywords matched in 'Helper_Tranche Name' (case-insensitive)
+    'esg_tranche_name': {
+        'Islamic': 'Sharia-Compliant',
+        'sharia': 'Sharia-Compliant',
+        'sukuk': 'Sharia-Compliant',
+        'green': 'Green',
+        'sustainab': 'Sustainability-Linked',
+        'social': 'Social',
+        'blue': 'Blue',
+    },
+    # 'Tranche ESG Type' keywords matched in 'Tranche Tertiary Type' (case-insensitive)
+    'esg_tranche_tertiary_type': {
+        'Sustainability-linked Loan': 'Sustainability-Linked',
+        'Sustainability-linked Bond': 'Sustainability-Linked',
+        'Green Loan': 'Green',
+        'Green Bond': 'Green',
+        'Islamic Loan': 'Sharia-Compliant',
+        'Islamic Bond': 'Sharia-Compliant',
+    },
+    # 'Tranche Role Type' values rewritten to 'Sponsor' on Equity tranches
+    'sponsor_equity_roles': ['Fund', 'Multilateral', 'Export Credit Agency', 'State Lender', 'Public Finance Institution', 'Institutional Investor', 'International Finance Institution'],
+    # 'Tranche Role Type' values rewritten to 'Debt Provider' on Debt tranches
+    'debt_provider_roles': ['Fund', 'Multilateral', 'Export Credit Agency', 'State Lender', 'Public Finance Institution', 'Institutional Investor', 'International Finance Institution', 'Development Equity'],
+    # Replacements in 'Tranche Role Type' (Tranche_Roles_Any tab)
+    'tranche_role_type': {
+        'MLA': 'Mandated Lead Arranger',
+        'Participant': 'Debt Provider',
+    },
+    # Replacements in 'Transaction Name' (Transaction tab)
+    'transaction_name': {
+        'Additional Facility': 'Additional Financing',
+        'Bond Facility': 'Bond',
+        ' and ': ' & ',
+        ' Cancelled': '',
+        'Acquisition of a Minority Stake in ': '',
+        'Acquisition of a Majority Stake in': '',
+        'Acquisition of a ': '',
+        'Acquisition of ': '',
+        'Acquisiition of ': '',
+        'Acquisiton of ': '',
+        'Acquisiion of ': '',
+        'Acquisistion of ': '',
+        'Acqusition of ': '',
+    },
+    # Replacements in 'Transaction Status' (Transaction tab)
+    'transaction_status': {
+        'Financial close': 'Financial Close',
+        'Pre-financing': 'Preparation',
+    },
+    # Replacements in 'Finance Type' (Transaction tab)
+    'finance_type': {
+        'Corporate Finance': 'Corporate',
+        'Non-Commercial Finance': 'Non-Commercial',
+        'Project Finance': 'Limited-Recourse',
+        'Design-Build': 'Corporate',
+        'Public Sector Finance': 'Non-Commercial',
+    },
+    # Replacements in 'Transaction Type' (Transaction tab)
+    'transaction_type': {
+        'Asset acquisition': 'Asset Acquisition',
+        'Company acquisition': 'Corporate Acquisition',
+        'Additional Facility': 'Additional Financing',
+    },
+    # Replacements in 'Region - Country' (Transaction tab)
+    'region_country': {
+        'China - Chinese Taipei': 'Taiwan',
+        'China - Hong Kong (SAR)': 'Hong Kong',
+        'China - Mainland': 'China',
+        'China - Macau': 'Macau',
+        'Cook Islands': '',
+        'Fiji Islands': '',
+        'Marshall Islands': '',
+        'Myanmar (Burma)': 'Myanmar',
+        'Timor-Leste (East Timor)': 'Timor-Leste',
+        'Tonga': '',
+        'Virgin Islands (US)': 'US Virgin Islands',
+        'Hong Kong (SAR)': 'Hong Kong',
+        'Mainland': 'China',
+        'Chinese Taipei': 'Taiwan',
+        'Macau (SAR)': 'Macau',
+        'North Macedonia': 'Republic of North Macedonia',
+    },
+    # Replacements in 'Contract' (Transaction tab)
+    'contract': {
+        'Unknown': '',
+    }
+}
+
+# Content version of the rule pack; create_destination_file writes it into each curated workbook's keywords
+# so the file can be traced back to the rules that produced it
+RULE_PACK_VERSION = hashlib.sha256(json.dumps(_RULES, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+
+# Function to compile a substring replacement table into ordered (old, new) pairs
+def compile_ordered_replacements(replacements, first=()):
+    ordered = [(old, replacements[old]) for old in first]
+    ordered += [(old, new) for old, new in replacements.items() if old not in first]
+    return tuple(ordered)
+
+# Function to compile an exact-match replacement table into a read-only hash map
+def compile_exact_lookup(replacements):
+    return MappingProxyType(dict(replacements))
+
+# Function to compile a keyword table into case-insensitive regexes
+def compile_keyword_patterns(keywords):
+    return tuple((re.compile(re.escape(keyword), re.IGNORECASE), value) for keyword, value in keywords.items())
+
+# Function to compile a list of [pattern, replacement] rewrites into regexes
+def compile_regex_rewrites(rewrites):
+    return tuple((re.compile(pattern), replacement) for pattern, replacement in rewrites)
+
+ANY_LEVEL_SECTOR_WORDS = compile_regex_rewrites(_RULES['any_level_sector_words'])
+# 'Other Beyond Infrastructure' must be replaced before 'Beyond Infra'
+ANY_LEVEL_SECTORS = compile_ordered_replacements(_RULES['any_level_sectors'], first=('Other Beyond Infrastructure',))
+EVENT_TYPE = compile_ordered_replacements(_RULES['event_type'])
+ROLE_TYPE = compile_ordered_replacements(_RULES['role_type'])
+CLIENT_COUNTERPARTY = compile_ordered_replacements(_RULES['client_counterparty'])
+TRANCHE_SECONDARY_TYPE = compile_exact_lookup(_RULES['tranche_secondary_type'])
+TRANCHE_TERTIARY_TYPE = compile_exact_lookup(_RULES['tranche_tertiary_type'])
+ESG_TRANCHE_NAME = compile_keyword_patterns(_RULES['esg_tranche_name'])
+ESG_TRANCHE_TERTIARY_TYPE = compile_keyword_patterns(_RULES['esg_tranche_tertiary_type'])
+SPONSOR_EQUITY_ROLES = frozenset(_RULES['sponsor_equity_roles'])
+DEBT_PROVIDER_ROLES = frozenset(_RULES['debt_provider_roles'])
+TRANCHE_ROLE_TYPE = compile_ordered_replacements(_RULES['tranche_role_type'])
+TRANSACTION_NAME = compile_ordered_replacements(_RULES['transaction_name'])
+TRANSACTION_STATUS = compile_ordered_replacements(_RULES['transaction_status'])
+FINANCE_TYPE = compile_ordered_replacements(_RULES['finance_type'])
+TRANSACTION_TYPE = compile_ordered_replacements(_RULES['transaction_type'])
+REGION_COUNTRY = compile_ordered_replacements(_RULES['region_country'])
+CONTRACT = compile_ordered_replacements(_RULES['contract'])
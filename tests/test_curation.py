@@ -0,0 +1,119 @@
+import openpyxl
+import pandas as pd
+
+import curation
+import rule_pack
+
+
+# Function to build a small Sheet1/Sheet2 pair with the columns read by the pipeline
+def make_source_frames():
+    ids = ['T1', 'T2', 'T3']
+    df1 = pd.DataFrame({
+        'Realfin INFRA Transaction Upload ID': ids,
+        'Transaction Name': ['Acquisition of  Solar Park and Grid ', 'Wind Farm', 'Toll Road'],
+        'Transaction Stage': ['Financial close', 'Pre-financing', 'Announced'],
+        'Finance Type': ['Project Finance', 'Corporate Finance', 'Public Sector Finance'],
+        'Transaction Type': ['Asset acquisition', 'Company acquisition', 'Additional Facility'],
+        'Transaction Currency': ['USD', 'EUR', 'GBP'],
+        'Transaction Value (Local Currency m)': [100.0, 200.0, 300.0],
+        'Transaction Debt (Local Currency m)': [70.0, 150.0, 250.0],
+        'Transaction Equity (Local Currency m)': [30.0, 50.0, 50.0],
+        'Debt/Equity Ratio': ['70:30', '75:25', 'N/A'],
+        'Transaction Country/Region': ['China - Mainland', 'Myanmar (Burma)', 'North Macedonia'],
+        'Transaction Sector': ['Beyond Infra', 'Power', 'Renewables'],
+        'Transaction Sub-sector': ['Other Beyond Infrastructure', 'Coal-fired', 'Biomass'],
+        'PPP': ['Yes', 'No', 'Yes'],
+        'Concession Period': ['25', '30', 'N/A'],
+        'Contract': ['DBFO', 'Unknown', 'DBFO'],
+        'Latest Transaction Event Date': ['2020-01-01', '2021-02-03', '2022-03-04'],
+        'Latest Transaction Event': ['Tender Launch', 'Transaction Announced', 'Risk Alert'],
+        'Financial Close Date': ['2020-06-01', 'N/A', '2022-09-01'],
+    })
+    df2 = pd.DataFrame({
+        'Realfin INFRA Transaction Upload ID': ids,
+        'SPV': ['SPV 1', 'SPV 2', 'SPV 3'],
+        'Transaction Announced Date': ['2019-01-01', 'N/A', '2021-01-01'],
+        'Transaction Request For Proposals Date': ['N/A', 'N/A', 'N/A'],
+        'Transaction Tender Launch Date': ['2019-06-01', 'N/A', 'N/A'],
+        'Transaction Preferred Bidder Date': ['N/A', '2020-05-05', 'N/A'],
+        'Transaction Role': ['O&M', 'Legal Adviser', 'N/A'],
+        'Company Name': ['Company A', 'Company B', 'Company C'],
+        'Advise To': ['AwardingAuthority', 'Sponsor', 'N/A'],
+        'Company Advised (Client Company)': ['Client A', 'Client B', 'N/A'],
+        'Realfin INFRA Tranche Upload ID': ['TR1', 'TR2', 'TR3'],
+        'Tranche Instrument Primary Type': ['Debt', 'Equity', 'Debt'],
+        'Tranche Instrument Secondary Type': ['Loans', 'Bonds', 'IFI Government Support'],
+        'Tranche Instrument Tertiary Type': ['Green Loan', 'Cash Equity', 'Revolver'],
+        'Tranche Name': ['Green Term Loan', 'Sukuk Tranche', 'Senior Debt'],
+        'Tranche Value ($m)': [50.0, 20.0, 0.0],
+        'Transaction Value (USD m)': [100.0, 200.0, 300.0],
+        'Transaction Value (Local Currency m)': [100.0, 180.0, 240.0],
+        'Tranche Maturity Start Date': ['2020-01-01', '2021-01-01', '2022-01-01'],
+        'Tranche Maturity End Date': ['2030-01-01', '2031-01-01', '2032-01-01'],
+        'Tranche Maturity Duration (Years)': [10, 10, 10],
+        'Tranche Loan Reference Rate': ['SOFR', None, 'EURIBOR'],
+        'Range From': [100, None, 150],
+        'Range To': [200, None, 250],
+        'Tranche Role': ['MLA', 'Fund', 'Multilateral'],
+        'LT Accredited Value ($m)': [25.0, 5.0, 10.0],
+        'Sponsor Equity (USDm)': [10.0, 20.0, 5.0],
+    })
+    return df1, df2
+
+
+# Function to write a Sheet1/Sheet2 pair as a source workbook
+def write_source_workbook(path, df1, df2):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df1.to_excel(writer, sheet_name='Sheet1', index=False)
+        df2.to_excel(writer, sheet_name='Sheet2', index=False)
+    return str(path)
+
+
+def test_repeated_runs_give_identical_sheets():
+    first = curation.build_curated_sheets(*make_source_frames())
+    second = curation.build_curated_sheets(*make_source_frames())
+
+    assert list(first) == list(second)
+    for sheet_name in first:
+        pd.testing.assert_frame_equal(first[sheet_name], second[sheet_name])
+
+
+def test_other_beyond_infrastructure_is_replaced_before_beyond_infra():
+    sheets = curation.build_curated_sheets(*make_source_frames())
+
+    # 'Beyond Infra' applied first would leave 'Other structure' behind
+    assert sheets['Transaction']['Any Level Sectors'].iloc[0] == ', '
+    pairs = [old for old, _ in rule_pack.ANY_LEVEL_SECTORS]
+    assert pairs.index('Other Beyond Infrastructure') < pairs.index('Beyond Infra')
+
+
+def test_destination_file_records_rule_pack_version(tmp_path):
+    source_path = write_source_workbook(tmp_path / 'source.xlsx', *make_source_frames())
+
+    destination_path = curation.create_destination_file(source_path, str(tmp_path))
+
+    workbook = openpyxl.load_workbook(destination_path)
+    assert workbook.properties.keywords == f"rule_pack:{rule_pack.RULE_PACK_VERSION}"
+
+
+def test_preview_samples_first_rows_with_full_run_tabs(tmp_path):
+    source_path = write_source_workbook(tmp_path / 'source.xlsx', *make_source_frames())
+
+    preview = curation.create_preview_sheets(source_path, 2)
+    full = curation.build_curated_sheets(*curation.read_source_file(source_path))
+
+    assert list(preview) == list(full)
+    assert len(preview['Transaction']) == 2
+
+
+def test_preview_builds_when_sampled_columns_are_blank(tmp_path):
+    df1, df2 = make_source_frames()
+    # Blank in the sampled rows only, so these columns are read as all-NaN floats
+    df2.loc[:1, 'Tranche Name'] = None
+    df2.loc[:1, 'Transaction Role'] = None
+    source_path = write_source_workbook(tmp_path / 'source.xlsx', df1, df2)
+
+    preview = curation.create_preview_sheets(source_path, 2)
+
+    assert preview['Bidders_Any'].empty
+    assert preview['Tranches']['Tranche ESG Type'].isna().all()